@@ -5,7 +5,9 @@ from langchain_core.runnables import RunnableLambda
 from dotenv import load_dotenv
 from pathlib import Path
 
+import atexit
 import os
+import threading
 
 # Progress logging + UI progress messages
 # - File/console logging is gated by MM_PROGRESS_LOG
@@ -26,7 +28,7 @@ def _snapshot_lines(tag: str, s: dict) -> list[str]:
     ct = (s.get("current_task") or {}) if isinstance(s, dict) else {}
     mq = (s.get("milestones_queue") or []) if isinstance(s, dict) else []
     tq = (s.get("task_queue") or []) if isinstance(s, dict) else []
-    last_ev = (s.get("events") or [{}])[-1] if isinstance(s, dict) and s.get("events") else {}
+    last_ev = s["events"][-1] if isinstance(s, dict) and s.get("events") else {}
     artifacts = (s.get("artifacts") or {}) if isinstance(s, dict) else {}
     gradle_ok = (artifacts.get("gradle_smoke") or {}).get("ok") if isinstance(artifacts, dict) else None
     return [
@@ -41,6 +43,34 @@ def _snapshot_lines(tag: str, s: dict) -> list[str]:
     ]
 
 
+# Anchored at the repo root (not the cwd), since the handle outlives any chdir
+_PROGRESS_LOG_PATH = Path(__file__).resolve().parents[2] / "runs" / "test_logs" / "full_pipeline_run.log"
+_progress_log_fh = None
+_PROGRESS_LOG_LOCK = threading.Lock()
+
+
+def _write_progress_log(text: str) -> None:
+    """
+    Append to the progress log through one line-buffered handle shared by all nodes.
+
+    Opened on first use and closed at interpreter exit; the lock keeps concurrent
+    runs (server threads) from interleaving snapshots. If the log was deleted
+    underneath us (e.g. runs/ was cleaned), the handle is reopened.
+    """
+    global _progress_log_fh
+    with _PROGRESS_LOG_LOCK:
+        # fstat on the open fd (no path lookup): st_nlink drops to 0 once the file is unlinked
+        if _progress_log_fh is not None and os.fstat(_progress_log_fh.fileno()).st_nlink == 0:
+            atexit.unregister(_progress_log_fh.close)
+            _progress_log_fh.close()
+            _progress_log_fh = None
+        if _progress_log_fh is None:
+            _PROGRESS_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _progress_log_fh = _PROGRESS_LOG_PATH.open("a", encoding="utf-8", buffering=1)
+            atexit.register(_progress_log_fh.close)
+        _progress_log_fh.write(text)
+
+
 def _maybe_wrap(name: str, fn, on_event=None):
     def _emit_ui_progress(state_like):
         if on_event is None:
@@ -116,15 +146,9 @@ def _maybe_wrap(name: str, fn, on_event=None):
         try:
             flag = os.getenv("MM_PROGRESS_LOG")
             if flag and flag.strip().lower() in {"1", "true", "yes", "on"}:
-                lines = _snapshot_lines(name, res if isinstance(res, dict) else {})
-                for ln in lines:
-                    print(ln, flush=True)
-                log_dir = Path("runs/test_logs")
-                log_dir.mkdir(parents=True, exist_ok=True)
-                with (log_dir / "full_pipeline_run.log").open("a", encoding="utf-8") as fh:
-                    for ln in lines:
-                        fh.write(ln + "\n")
-                    fh.flush()
+                text = "\n".join(_snapshot_lines(name, res if isinstance(res, dict) else {}))
+                print(text, flush=True)
+                _write_progress_log(text + "\n")
         except Exception:
             pass
         return res
@@ -160,7 +184,27 @@ from .nodes.qa_subgraph import qa_subgraph
 # Routing Imports
 from .nodes.router import route_task, route_after_handle_result, route_after_verify, route_after_respond, route_after_await
 
-def build_graph(on_event=None, checkpointer=None):
+_COMPILED_DEFAULT = None
+_COMPILED_LOCK = threading.Lock()
+
+
+def build_graph(on_event=None, checkpointer=None, *, _cache=True):
+    """Compile the agent graph.
+
+    The default build (no on_event, no checkpointer) is compiled once and reused.
+    Nodes are bound at compile time, so callers that monkeypatch node symbols
+    on this module must pass `_cache=False` to get a fresh graph.
+    """
+    global _COMPILED_DEFAULT
+    if not _cache or on_event is not None or checkpointer is not None:
+        return _build_graph(on_event, checkpointer)
+    with _COMPILED_LOCK:
+        if _COMPILED_DEFAULT is None:
+            _COMPILED_DEFAULT = _build_graph(None, None)
+        return _COMPILED_DEFAULT
+
+
+def _build_graph(on_event=None, checkpointer=None):
     BACKEND_ENV = Path(__file__).resolve().parents[1] / ".env"
     load_dotenv(BACKEND_ENV, override=False)
     g = StateGraph(AgentState)
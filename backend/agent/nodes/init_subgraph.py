@@ -2,7 +2,7 @@ from pathlib import Path
 from ..state import AgentState
 from ...core.models import Framework
 from ..wrappers.storage import STORAGE as storage
-from ..tools.init.providers import resolve_url, download
+from ..tools.init.providers import resolve_url, download, is_cached, record_download
 from ..tools.init.archive import extract_archive
 from ..tools.init.workspace import create as ws_create, copy_from_extracted
 from ..tools.init.version import detect_minecraft_version
@@ -36,14 +36,19 @@ def init_subgraph(state: AgentState) -> AgentState:
     runs_root = Path(state.get("runs_root") or "runs")
     downloads_root = Path(state.get("downloads_root") or "runs/_downloads")
 
-    # 1) Resolve + download
+    # 1) Resolve + download (an MDK already verified against the downloads manifest is reused)
     fw_enum = Framework[framework.upper()]
     pr = resolve_url(fw_enum, mc_version)
     dl_dir = downloads_root / framework / mc_version
 
     storage.ensure_dir(dl_dir)
     dest_zip = dl_dir / pr.filename
-    download(pr.url, dest_zip)
+    if pr.cacheable and is_cached(pr.url, dest_zip):
+        print(f"[init] Reusing verified MDK: {dest_zip}")
+    else:
+        download(pr.url, dest_zip)
+        if pr.cacheable:
+            record_download(pr.url, dest_zip)
 
     # Record artifacts for tests/snapshots
     state.setdefault("artifacts", {})["mdk_zip_path"] = str(dest_zip)
@@ -1,12 +1,15 @@
 """
 Providers for downloading a fresh starter (MDK / template) per framework & MC version.
 
-This module intentionally does **no caching** — call it every time for now.
-Later, you can plug it behind a cache layer without changing call sites.
+URLs are always resolved fresh. Downloads of immutable artifacts can be reused:
+a per-directory manifest (.sha256) records the URL and sha256 of each verified
+file, and callers skip download() while both still match.
 
 Public surface:
 - resolve_url(framework: str, mc_version: str) -> str
 - download(url: str, dest_path: Path, *, timeout: int = 120) -> None
+- is_cached(url: str, dest_path: Path) -> bool
+- record_download(url: str, dest_path: Path) -> None
 
 Supported frameworks (initial): "forge", "fabric", "neoforge".
 
@@ -24,6 +27,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
+import hashlib
 import json
 import xml.etree.ElementTree as ET
 import urllib.request
@@ -40,6 +44,8 @@ class ProviderResult:
     url: str
     filename: str
     notes: str = ""
+    # False for URLs whose content can change (e.g. a branch head archive); never reused
+    cacheable: bool = True
 
 
 # --------------------
@@ -79,6 +85,49 @@ def download(url: str, dest_path: Path, *, timeout: int = 120) -> None:
         raise RuntimeError(f"Network error downloading {url}: {e.reason}") from e
 
 
+# Per-download-dir manifest: {filename: {"url": ..., "sha256": ...}}
+MANIFEST_NAME = ".sha256"
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_manifest(dir_path: Path) -> dict:
+    from backend.agent.wrappers.storage import STORAGE as storage
+    manifest = Path(dir_path) / MANIFEST_NAME
+    if not storage.is_file(manifest):
+        return {}
+    try:
+        data = json.loads(storage.read_text(manifest))
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def is_cached(url: str, dest_path: Path) -> bool:
+    """True when dest_path exists and still matches the url + sha256 recorded by record_download."""
+    from backend.agent.wrappers.storage import STORAGE as storage
+    dest_path = Path(dest_path)
+    entry = _read_manifest(dest_path.parent).get(dest_path.name)
+    if not isinstance(entry, dict) or entry.get("url") != url or not storage.is_file(dest_path):
+        return False
+    return entry.get("sha256") == _sha256_file(dest_path)
+
+
+def record_download(url: str, dest_path: Path) -> None:
+    """Record url + sha256 of a completed download in its directory's manifest."""
+    from backend.agent.wrappers.storage import STORAGE as storage
+    dest_path = Path(dest_path)
+    manifest = _read_manifest(dest_path.parent)
+    manifest[dest_path.name] = {"url": url, "sha256": _sha256_file(dest_path)}
+    storage.write_text(dest_path.parent / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True))
+
+
 # --------------------
 # Forge
 # --------------------
@@ -165,10 +214,12 @@ def _resolve_fabric_template_url(mc_version: str) -> ProviderResult:
     # Probe the branch; if 404, fallback to main (we don't download content here, only HEAD)
     branch_url = FABRIC_EXAMPLE_REPO.format(branch=branch_guess)
     if _url_exists(branch_url):
-        return ProviderResult(url=branch_url, filename=f"fabric-example-mod-{branch_guess}.zip", notes="fabric example branch")
+        return ProviderResult(url=branch_url, filename=f"fabric-example-mod-{branch_guess}.zip", notes="fabric example branch",
+                              cacheable=False)
     # Fallback
     main_url = FABRIC_EXAMPLE_REPO.format(branch="main")
-    return ProviderResult(url=main_url, filename="fabric-example-mod-main.zip", notes="fabric example main")
+    return ProviderResult(url=main_url, filename="fabric-example-mod-main.zip", notes="fabric example main",
+                          cacheable=False)
 
 
 # --------------------
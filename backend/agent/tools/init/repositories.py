@@ -5,6 +5,8 @@ from pathlib import Path
 import os
 import re
 import json
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Optional, Tuple
 from .version import detect_minecraft_version
 from backend.agent.wrappers.storage import STORAGE as storage
@@ -29,23 +31,34 @@ def _parse_semver(s: str) -> tuple[int, int, int]:
         parts.append(0)
     return tuple(parts[:3])
 
-def _nearest_parchment_date_for(mc_req: str, table: dict[str, str]) -> tuple[Optional[str], str]:
+ParchmentIndex = Tuple[Tuple[Tuple[int, int, int], ...], Tuple[str, ...]]
+
+def _parchment_index(table: dict[str, str]) -> ParchmentIndex:
+    """Table keys sorted by parsed version: (versions, keys), parallel tuples."""
+    entries = sorted((_parse_semver(k), k) for k in table)
+    return tuple(v for v, _ in entries), tuple(k for _, k in entries)
+
+@lru_cache(maxsize=8)
+def _load_parchment_map(path: str, mtime_ns: int, size: int) -> tuple[dict[str, str], ParchmentIndex]:
+    data = json.loads(Path(path).read_text(encoding="utf-8")) or {}
+    table: dict[str, str] = data.get("minecraft_to_parchment", {}) or {}
+    return table, _parchment_index(table)
+
+def _read_parchment_map(map_path: Path) -> tuple[dict[str, str], ParchmentIndex]:
+    """Parse + index parchment_versions.json, cached until the file changes."""
+    st = map_path.stat()
+    return _load_parchment_map(str(map_path), st.st_mtime_ns, st.st_size)
+
+def _nearest_parchment_date_for(mc_req: str, table: dict[str, str],
+                                index: Optional[ParchmentIndex] = None) -> tuple[Optional[str], str]:
     # exact
     if mc_req in table:
         return table[mc_req], mc_req
-    rM, rm, rp = _parse_semver(mc_req)
-    same_minor, lower_all = [], []
-    for k in table.keys():
-        kM, km, kp = _parse_semver(k)
-        if (kM, km) == (rM, rm) and kp <= rp:
-            same_minor.append((kM, km, kp, k))
-        if (kM, km, kp) <= (rM, rm, rp):
-            lower_all.append((kM, km, kp, k))
-    if same_minor:
-        _, _, _, chosen = max(same_minor)
-        return table[chosen], chosen
-    if lower_all:
-        _, _, _, chosen = max(lower_all)
+    # otherwise the highest key <= requested (same-minor entries sort above older minors)
+    versions, keys = index if index is not None else _parchment_index(table)
+    i = bisect_right(versions, _parse_semver(mc_req))
+    if i:
+        chosen = keys[i - 1]
         return table[chosen], chosen
     return None, mc_req
 
@@ -420,11 +433,10 @@ def enable_parchment_for_forge(ws: Path, mc_version: Optional[str] = None) -> st
     map_path = _parchment_map_path()
     if not map_path.exists():
         raise FileNotFoundError(f"parchment_versions.json not found at {map_path}.")
-    data = json.loads(map_path.read_text(encoding="utf-8")) or {}
-    table: dict[str, str] = data.get("minecraft_to_parchment", {}) or {}
+    table, index = _read_parchment_map(map_path)
 
     # _nearest_parchment_date_for returns (date_str|None, chosen_mc_key)
-    date, chosen_mc = _nearest_parchment_date_for(mc_detected, table)
+    date, chosen_mc = _nearest_parchment_date_for(mc_detected, table, index)
     version_tag = f"{(date or 'TBD')}-{chosen_mc}"
 
     # ---- 2) settings.gradle/.kts: ensure Parchment plugin repo ----
@@ -567,10 +579,9 @@ def enable_parchment_for_neoforge(ws: Path, mc_version: Optional[str] = None) ->
         raise FileNotFoundError(
             f"parchment_versions.json not found at {map_path}. This file is required; no fallback is allowed."
         )
-    data = json.loads(map_path.read_text(encoding="utf-8")) or {}
-    table = data.get("minecraft_to_parchment", {}) or {}
+    table, index = _read_parchment_map(map_path)
 
-    date, _ = _nearest_parchment_date_for(mc_detected, table)
+    date, _ = _nearest_parchment_date_for(mc_detected, table, index)
     version_tag = f"{(date or 'TBD')}-{mc_detected}"
 
     # 2) gradle.properties only
@@ -14,6 +14,8 @@ from __future__ import annotations
 from pathlib import Path
 from contextlib import contextmanager
 from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import os
 import shutil
 import stat
 import zipfile
@@ -154,13 +156,17 @@ class LocalStorage(Storage):
                     # path traversal guard
                     for m in members:
                         _guard_no_traversal(dest_dir, dest_dir / m.filename)
-                    for m in members:
-                        if m.filename.endswith("/"):
-                            continue
+                    # Inflate members in parallel; zlib releases the GIL while decompressing
+                    def _extract_member(m: zipfile.ZipInfo) -> None:
                         data = zf.read(m)
                         out = dest_dir / m.filename
                         self.ensure_parent_dir(out)
                         self.write_bytes(out, data)
+
+                    files = [m for m in members if not m.filename.endswith("/")]
+                    with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as pool:
+                        # list() surfaces the first worker exception, if any
+                        list(pool.map(_extract_member, files))
         elif suffixes.endswith((".tar.gz", ".tgz", ".tar.xz", ".tar.bz2", ".tar")):
             mode = "r:*"
             with self.open_for_read_bytes(archive_path) as f:
@@ -0,0 +1,248 @@
+"""
+Filesystem helpers for persisting e2e test artifacts (workspace copies, logs).
+
+Copies try the cheapest kernel path first:
+  1) FICLONE reflink (btrfs/xfs: copy-on-write, no data moved)
+  2) os.copy_file_range (in-kernel copy, no userspace buffers)
+  3) buffered copy with a 1 MiB buffer
+and then copy metadata like shutil.copy2 (mirroring relies on preserved mtimes).
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+from pathlib import Path
+from typing import Sequence
+
+try:
+    import fcntl  # type: ignore
+except Exception:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+_FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+_COPY_BUFSIZE = 1024 * 1024
+# Regenerable Gradle output; never worth archiving
+_TAR_EXCLUDE_DIRS = frozenset({".gradle", "build", "caches"})
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Reflink or copy_file_range `src_fd` into `dst_fd`. Returns False if neither applies."""
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            return True
+        except OSError:
+            pass
+    if hasattr(os, "copy_file_range"):
+        copied = 0
+        try:
+            while copied < size:
+                n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            return False
+        return copied == size
+    return False
+
+
+def fast_copy(src, dst, *, follow_symlinks: bool = True):
+    """Drop-in for shutil.copy2 using reflink/copy_file_range when available."""
+    if not follow_symlinks and os.path.islink(src):
+        return shutil.copy2(src, dst, follow_symlinks=False)
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    done = False
+    if sys.platform.startswith("linux"):
+        with open(src, "rb") as fsrc:
+            size = os.fstat(fsrc.fileno()).st_size
+            dst_fd = os.open(dst, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o666)
+            try:
+                done = _kernel_copy(fsrc.fileno(), dst_fd, size)
+            finally:
+                os.close(dst_fd)
+    if not done:
+        with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+            shutil.copyfileobj(fsrc, fdst, length=_COPY_BUFSIZE)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _unchanged(src, dst, src_stat: os.stat_result | None = None) -> bool:
+    """True when `dst` already matches `src` by size and mtime (copystat preserves mtime_ns)."""
+    try:
+        s = src_stat if src_stat is not None else os.stat(src)
+        d = os.stat(dst)
+    except OSError:
+        return False
+    return s.st_size == d.st_size and s.st_mtime_ns == d.st_mtime_ns
+
+
+def sync_copy(src, dst, *, follow_symlinks: bool = True, link_from=None, src_stat: os.stat_result | None = None):
+    """
+    `fast_copy` that skips files whose size and mtime already match at `dst`.
+
+    With `link_from` (the same file in a previous snapshot) an unchanged file is
+    hardlinked from there instead of copied. A stale `dst` is unlinked first, so a
+    rewrite never goes through an inode shared with another snapshot.
+    `src_stat` lets callers pass a stat they already have (e.g. from os.scandir).
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if follow_symlinks and _unchanged(src, dst, src_stat):
+        return dst
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    if link_from is not None and follow_symlinks and _unchanged(src, link_from, src_stat):
+        try:
+            os.link(link_from, dst)
+            return dst
+        except OSError:  # other filesystem / no hardlink support
+            pass
+    return fast_copy(src, dst, follow_symlinks=follow_symlinks)
+
+
+def _mirror_dir(src: str, dst: str, ignore, link_root: str | None) -> None:
+    """
+    One os.scandir pass per directory: prune stale/ignored/retyped entries in `dst`, then sync.
+
+    DirEntry caches type (and, on Windows, stat) info, so unlike os.walk-prune + copytree
+    each source entry is listed once and stat'ed at most once.
+    """
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        entries = list(it)
+    ignored = ignore(src, [e.name for e in entries]) if ignore is not None else ()
+    wanted = {e.name: e for e in entries if e.name not in ignored}
+
+    with os.scandir(dst) as it:
+        for d in it:
+            e = wanted.get(d.name)
+            d_is_dir = d.is_dir(follow_symlinks=False)
+            if e is None or e.is_dir() != d_is_dir:
+                if d_is_dir:
+                    shutil.rmtree(d.path)
+                else:
+                    os.unlink(d.path)
+
+    for name, e in wanted.items():
+        target = os.path.join(dst, name)
+        prev = os.path.join(link_root, name) if link_root is not None else None
+        if e.is_dir():
+            _mirror_dir(e.path, target, ignore, prev)
+        else:
+            sync_copy(e.path, target, link_from=prev, src_stat=e.stat())
+    shutil.copystat(src, dst)
+
+
+def mirror_tree(src, dst, *, link_dest=None, excludes: Sequence[str] = ()) -> None:
+    """
+    Make `dst` an exact copy of `src`, rewriting only files that changed.
+
+    Windows: robocopy /MIR (multithreaded; far faster than copytree there).
+    Elsewhere: a single os.scandir walk that prunes stale entries and syncs files with
+    `sync_copy`; files unchanged since the `link_dest` snapshot are hardlinked from it.
+    `excludes` are name globs (e.g. "build", "*.class") left out of `dst` at any depth.
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    if sys.platform == "win32" and shutil.which("robocopy"):
+        cmd = ["robocopy", src, dst, "/MIR", "/MT:16", "/NDL", "/NFL", "/NJH", "/NJS", "/NP"]
+        if excludes:
+            cmd += ["/XD", *excludes, "/XF", *excludes]
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL)
+        # robocopy exit codes < 8 are success (bit flags: copied / extra / mismatched)
+        if proc.returncode < 8:
+            return
+    ignore = shutil.ignore_patterns(*excludes) if excludes else None
+    _mirror_dir(src, dst, ignore, os.fspath(link_dest) if link_dest is not None else None)
+
+
+def rsync_tree(src, dst, *, link_dest=None, excludes: Sequence[str] = ()) -> bool:
+    """
+    Mirror `src` into `dst` with `rsync -aH --delete` (only changed files are transferred).
+
+    With `link_dest` (a previous snapshot) unchanged files are hardlinked from it;
+    `excludes` are name globs left out of (and deleted from) `dst`.
+    Returns False when rsync is unavailable or fails, so callers can fall back to `mirror_tree`.
+    """
+    rsync = shutil.which("rsync")
+    if not rsync:
+        return False
+    os.makedirs(dst, exist_ok=True)
+    cmd = [rsync, "-aH", "--delete"]
+    if link_dest is not None and os.path.isdir(link_dest):
+        cmd.append(f"--link-dest={os.path.abspath(link_dest)}")
+    if excludes:
+        cmd += ["--delete-excluded", *(f"--exclude={pat}" for pat in excludes)]
+    proc = subprocess.run(
+        cmd + [os.path.join(os.fspath(src), ""), os.path.join(os.fspath(dst), "")],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    return proc.returncode == 0
+
+
+def tar_pipe_tree(src, dst, *, excludes: Sequence[str] = ()) -> bool:
+    """
+    Copy `src` into `dst` by streaming `tar -cf - | tar -xf -` (one pipe, no per-file process work).
+
+    Meant for fresh destinations; returns False when tar is unavailable or either side fails.
+    """
+    tar = shutil.which("tar")
+    if not tar:
+        return False
+    os.makedirs(dst, exist_ok=True)
+    # pax format keeps sub-second mtimes, so size+mtime checks against this snapshot still match
+    create = [tar, "--format=pax", "-cf", "-", *(f"--exclude={pat}" for pat in excludes), "-C", os.fspath(src), "."]
+    producer = subprocess.Popen(create, stdout=subprocess.PIPE)
+    consumer = subprocess.Popen([tar, "-xf", "-", "-C", os.fspath(dst)], stdin=producer.stdout)
+    producer.stdout.close()  # consumer owns the read end; producer gets SIGPIPE if it exits early
+    return consumer.wait() == 0 and producer.wait() == 0
+
+
+def _exclude_regenerable(info: tarfile.TarInfo):
+    """tarfile filter dropping .gradle/, build/ and caches/ below the archive root."""
+    if _TAR_EXCLUDE_DIRS.intersection(info.name.split("/")[1:]):
+        return None
+    return info
+
+
+def write_tarball(src, dest_base, arcname: str) -> Path:
+    """
+    Stream `src` into a single archive next to `dest_base` and return its path.
+
+    <dest_base>.tar.zst (zstandard level 1) when zstandard is installed, else <dest_base>.tar.gz.
+    """
+    if zstandard is not None:
+        out = Path(f"{dest_base}.tar.zst")
+        with open(out, "wb") as raw, zstandard.ZstdCompressor(level=1).stream_writer(raw) as zw, \
+                tarfile.open(fileobj=zw, mode="w|") as tf:
+            tf.add(os.fspath(src), arcname=arcname, filter=_exclude_regenerable)
+    else:
+        out = Path(f"{dest_base}.tar.gz")
+        with tarfile.open(out, "w:gz", compresslevel=1) as tf:
+            tf.add(os.fspath(src), arcname=arcname, filter=_exclude_regenerable)
+    return out
+
+
+def tail_lines(path, n: int = 500, chunk: int = 64 * 1024) -> str:
+    """Return the last `n` lines of a (possibly large) log file, reading backwards in blocks."""
+    buf = bytearray()
+    with open(path, "rb") as fh:
+        pos = os.fstat(fh.fileno()).st_size
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(chunk, pos)
+            pos -= step
+            fh.seek(pos)
+            buf[:0] = fh.read(step)
+    lines = bytes(buf).splitlines()[-n:] if n > 0 else []
+    return b"\n".join(lines).decode("utf-8", errors="replace")
@@ -0,0 +1,60 @@
+"""
+Disk-backed cache for deterministic LLM calls made directly by e2e tests.
+
+Entries are JSON files under <MM_TEST_ARTIFACTS_ROOT or runs/_test_artifacts>/_llm_cache/<hash>.json:
+  {"input_hash", "prompt_version", "model_id", "response", "created_at"}
+
+Set MM_TEST_LLM_NO_CACHE=1 to bypass the cache (always call the model, never write).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("MM_TEST_ARTIFACTS_ROOT", "runs/_test_artifacts")) / "_llm_cache"
+
+
+def enabled() -> bool:
+    return os.getenv("MM_TEST_LLM_NO_CACHE", "").strip().lower() not in ("1", "true", "yes")
+
+
+def cache_key(**parts: Any) -> str:
+    """sha256 over the sorted JSON of everything that determines the response."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Cached response for `key`, or None on miss / bypass / unreadable entry."""
+    if not enabled():
+        return None
+    try:
+        entry = json.loads((_cache_dir() / f"{key}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    response = entry.get("response")
+    return response if isinstance(response, dict) else None
+
+
+def set(key: str, value: Dict[str, Any], *, model_id: str = "", prompt_version: str = "") -> None:
+    """Store `value` for `key` (atomic replace, so parallel workers never see partial files)."""
+    if not enabled():
+        return
+    root = _cache_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "input_hash": key,
+        "prompt_version": prompt_version,
+        "model_id": model_id,
+        "response": value,
+        "created_at": int(time.time()),
+    }
+    tmp = root / f".{key}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(entry, indent=2, sort_keys=True, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, root / f"{key}.json")
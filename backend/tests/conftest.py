@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import contextlib
+import copy
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+try:
+    from filelock import FileLock  # type: ignore
+except Exception:  # pragma: no cover
+    FileLock = None  # type: ignore
+
+
+def _load_env_files() -> None:
+    """Load the repo-root .env (if found) and backend/.env without overriding the process env."""
+    try:
+        from dotenv import load_dotenv, find_dotenv
+    except Exception:  # pragma: no cover
+        return
+    root_env = find_dotenv(usecwd=True)
+    if root_env:
+        load_dotenv(root_env, override=False)
+    backend_env = Path(__file__).resolve().parents[1] / ".env"  # backend/.env
+    if backend_env.exists():
+        load_dotenv(backend_env, override=False)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "slow: end-to-end tests (network, Gradle, LLM); opt in with --run-slow, parallelize with -n 3"
+    )
+    # Once per session, before test modules are imported, so module-level
+    # skipif markers (e.g. on GOOGLE_API_KEY) already see the .env values.
+    _load_env_files()
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    # --run-slow is registered by the repo-root conftest.py
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow e2e test; pass --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def compiled_graph():
+    """
+    Compile the agent graph once per session.
+
+    Only for tests that run the real nodes: build_graph() binds node functions
+    from backend.agent.graph at compile time, so tests that monkeypatch those
+    symbols must call build_graph(_cache=False) themselves after patching.
+    """
+    from backend.agent.graph import build_graph
+
+    return build_graph()
+
+
+# Deterministic provider outputs for stubbed graph runs (built once at import)
+_STUB_OUTLINE: Dict[str, Any] = {
+    "project_summary": "Test outline",
+    "milestones": [
+        {"id": "M1", "title": "Add item", "objective": "Add a custom item", "deliverables": []}
+    ],
+}
+_STUB_NEXT_TASKS: Dict[str, Any] = {
+    "milestone_title": "Add item",
+    "tasks": [
+        {"type": "add_custom_item", "title": "Add custom item", "params": {}}
+    ],
+}
+_STUB_ITEM_SCHEMA: Dict[str, Any] = {
+    "item_id": "test_item",
+    "display_name": "Test Item",
+    "add_to_creative": True,
+    "creative_tab_key": "CreativeModeTabs.INGREDIENTS",
+    "model_type": "basicItem",
+    "registry_constant": "TEST_ITEM",
+}
+
+
+def _const_runnable(value: Dict[str, Any]):
+    """RunnableLambda returning a fresh copy of `value` (nodes mutate task/milestone dicts downstream)."""
+    from langchain_core.runnables import RunnableLambda
+
+    return RunnableLambda(lambda _x: copy.deepcopy(value))
+
+
+@pytest.fixture()
+def stub_providers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stub the outline, next-tasks and item-schema LLM providers with the constants above."""
+    import backend.agent.providers.plan_outline as pov
+    import backend.agent.providers.gpt5_provider as pnt
+    import backend.agent.providers.item_schema as pis
+
+    outline = _const_runnable(_STUB_OUTLINE)
+    next_tasks = _const_runnable(_STUB_NEXT_TASKS)
+    item_schema = _const_runnable(_STUB_ITEM_SCHEMA)
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "stub")  # ensure provider gates don't abort early
+    monkeypatch.setattr(pov, "build_high_level_outline", lambda: outline)
+    monkeypatch.setattr(pnt, "build_next_tasks_planner", lambda: next_tasks)
+    monkeypatch.setattr(pis, "build_item_schema_extractor", lambda: item_schema)
+
+
+@pytest.fixture(scope="session")
+def shared_downloads_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    One downloads root for the session, so MDK archives are shared across cases.
+
+    Set MM_DOWNLOADS_CACHE to a stable directory to also reuse it across sessions.
+    Otherwise it lives under pytest's basetemp; under pytest-xdist each worker
+    gets its own basetemp (…/pytest-N/popen-gwK), so their common parent is used
+    and all workers share the same root.
+    """
+    cache = os.getenv("MM_DOWNLOADS_CACHE")
+    if cache:
+        root = Path(cache)
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+    base = tmp_path_factory.getbasetemp()
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        base = base.parent
+    root = base / "_downloads_shared"
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _path_lock(lock_path: Path):
+    """Cross-process lock on `lock_path` (a no-op context when filelock is not installed)."""
+    if FileLock is None:
+        return contextlib.nullcontext()
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    return FileLock(str(lock_path))
+
+
+@pytest.fixture(scope="session")
+def downloads_lock(shared_downloads_root: Path):
+    """Lock factory for one <framework>/<mc_version> download dir."""
+    def _lock(framework: str, mc_version: str):
+        return _path_lock(shared_downloads_root / f".{framework}-{mc_version}.lock")
+    return _lock
+
+
+@pytest.fixture(scope="session")
+def artifacts_lock():
+    """Lock factory for persisting one artifact dir (e.g. runs/_test_artifacts/<name>) across xdist workers."""
+    def _lock(dest: Path):
+        return _path_lock(Path(dest).parent / f".{Path(dest).name}.lock")
+    return _lock
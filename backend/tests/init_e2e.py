@@ -21,13 +21,18 @@ Exit code 0 means all requested frameworks completed the smoke build.
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
+import os
 import sys
 import platform  # <-- Added for architecture detection
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, List
 
-from backend.agent.tools.init.providers import resolve_url, download
+from backend.agent.tools.init.providers import resolve_url, download, USER_AGENT
 from backend.agent.tools.init.archive import extract_archive
 from backend.core.models import Framework
 from backend.agent.tools.init.workspace import create as ws_create, copy_from_extracted
@@ -57,6 +62,17 @@ def _print_step(step: StepResult) -> None:
     print(f"- {color}{status}{RESET} {step.name}{DIM}{(': ' + step.msg) if step.msg else ''}{RESET}")
 
 
+def _remote_size(url: str, timeout: int = 10) -> Optional[int]:
+    """Return the Content-Length reported by a HEAD request, or None if unknown."""
+    req = urllib.request.Request(url, method="HEAD", headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            length = r.headers.get("Content-Length")
+        return int(length) if length else None
+    except Exception:
+        return None
+
+
 def _do_one(framework: str, mc_version: str, modid: str, group: str, package: str,
             runs_root: Path, downloads_root: Path, timeout: int,
             name: Optional[str], desc: Optional[str], authors: List[str], task_override: Optional[str]) -> int:
@@ -79,9 +95,14 @@ def _do_one(framework: str, mc_version: str, modid: str, group: str, package: st
     dest_zip = dl_dir / pr.filename
 
     try:
-        download(pr.url, dest_zip)
-        size = len(storage.read_bytes(dest_zip)) if storage.exists(dest_zip) else 0
-        _print_step(StepResult("download", True, f"→ {dest_zip} ({size} bytes)"))
+        # Reuse a zip from a previous run when it matches the remote size
+        remote_size = _remote_size(pr.url) if dest_zip.is_file() else None
+        if remote_size is not None and dest_zip.stat().st_size == remote_size:
+            _print_step(StepResult("download", True, f"cached {dest_zip} ({remote_size} bytes)"))
+        else:
+            download(pr.url, dest_zip)
+            size = dest_zip.stat().st_size if storage.exists(dest_zip) else 0
+            _print_step(StepResult("download", True, f"→ {dest_zip} ({size} bytes)"))
     except Exception as e:
         _print_step(StepResult("download", False, str(e)))
         return 2
@@ -159,6 +180,14 @@ def _do_one(framework: str, mc_version: str, modid: str, group: str, package: st
         return 8
 
 
+def _do_one_captured(*args) -> tuple[int, str]:
+    """Run `_do_one` in a worker process, capturing its report so it can be printed in order."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        rc = _do_one(*args)
+    return rc, buf.getvalue()
+
+
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--framework", nargs="+", required=True, choices=["forge", "fabric", "neoforge"])
@@ -181,14 +210,31 @@ def main(argv: list[str] | None = None) -> int:
     print(f"== init_e2e ==\nFrameworks: {', '.join(args.framework)}\nMC: {args.mc}\nRuns root: {runs_root}\nDownloads root: {downloads_root}\nTimeout: {args.timeout}s")
 
     failures = 0
-    for fw in args.framework:
+    if len(args.framework) == 1:
         rc = _do_one(
-            fw, args.mc, args.modid, args.group, args.package,
+            args.framework[0], args.mc, args.modid, args.group, args.package,
             runs_root, downloads_root, args.timeout,
             args.name, args.desc, args.author, args.task_override,
         )
-        if rc != 0:
-            failures += 1
+        failures += int(rc != 0)
+    else:
+        # Extraction/placeholders are CPU-bound, so run one process per framework
+        # and print each framework's report in the requested order once it's done.
+        workers = min(len(args.framework), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _do_one_captured,
+                    fw, args.mc, args.modid, args.group, args.package,
+                    runs_root, downloads_root, args.timeout,
+                    args.name, args.desc, args.author, args.task_override,
+                )
+                for fw in args.framework
+            ]
+            for fut in futures:
+                rc, report = fut.result()
+                print(report, end="")
+                failures += int(rc != 0)
 
     print(f"\nSummary: {len(args.framework) - failures} OK, {failures} FAIL")
     return 0 if failures == 0 else 1
@@ -89,6 +89,19 @@ def ensure_dest_dir(dest: Path | None) -> Path:
     return dest
 
 
+def _sanity_check_filename(fw_name: str, filename: str) -> None:
+    """Light sanity checks per framework; raises AssertionError on mismatch."""
+    if fw_name == "forge":
+        if not filename.endswith("-mdk.zip"):
+            raise AssertionError("Expected a Forge MDK ZIP (…-mdk.zip)")
+    elif fw_name == "neoforge":
+        # We use NeoForgeMDKs GitHub archives, e.g., MDK-1.21-NeoGradle-main.zip
+        if not (filename.startswith("MDK-") and filename.endswith(".zip")):
+            raise AssertionError("Expected a NeoForge MDK GitHub ZIP (e.g., MDK-…-main.zip)")
+    elif fw_name == "fabric" and not filename.endswith(".zip"):
+        raise AssertionError("Expected a zip filename for fabric example mod")
+
+
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
     dest_dir = ensure_dest_dir(args.dest) if args.download else None
@@ -112,6 +125,8 @@ def main(argv: List[str]) -> int:
                 print("OK")
                 print(f"   url:      {result.url}")
                 print(f"   filename: {result.filename}")
+                # Check the filename before downloading so a broken provider fails fast
+                _sanity_check_filename(fw_name, result.filename)
                 if args.download:
                     out_path = (dest_dir / fw_name / mc_version)
                     out_path.mkdir(parents=True, exist_ok=True)
@@ -122,18 +137,6 @@ def main(argv: List[str]) -> int:
                     sha = _sha256(file_path)
                     print(f"   size: {size} bytes, sha256: {sha}")
 
-                # Light sanity checks per framework
-                # Light sanity checks per framework
-                if fw_name == "forge":
-                    if not result.filename.endswith("-mdk.zip"):
-                        raise AssertionError("Expected a Forge MDK ZIP (…-mdk.zip)")
-                elif fw_name == "neoforge":
-                    # We use NeoForgeMDKs GitHub archives, e.g., MDK-1.21-NeoGradle-main.zip
-                    if not (result.filename.startswith("MDK-") and result.filename.endswith(".zip")):
-                        raise AssertionError("Expected a NeoForge MDK GitHub ZIP (e.g., MDK-…-main.zip)")
-                elif fw_name == "fabric" and not result.filename.endswith(".zip"):
-                    raise AssertionError("Expected a zip filename for fabric example mod")
-
             except NameError as ne:
                 # Common coding mistake guard: undefined key_rec in forge resolver
                 print("FAIL (NameError)")
@@ -1,9 +1,14 @@
 # backend/tests/query_test.py
 from __future__ import annotations
-import os, json
+import asyncio, os, json
 from pathlib import Path
 from dotenv import load_dotenv, find_dotenv
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 # Load .env (repo root or backend/.env)
 env = find_dotenv() or (Path(__file__).resolve().parents[1] / ".env")
 load_dotenv(env)
@@ -13,9 +18,28 @@ from backend.rag.retrieval.query_vector_store import query_vector_store
 # Config (env-driven)
 STORE = os.getenv("STORE_NAME", "minecraft_mods_custom_v1")
 QUERY = os.getenv("TEST_QUERY", "Change the hardness of a block")
+QUERIES = [q.strip() for q in os.getenv("TEST_QUERIES", "").split("|") if q.strip()]
 TOP_K = int(os.getenv("TOP_K", "1"))
 OUT_PATH = Path(os.getenv("OUTPUT_FILE", "") or (Path(__file__).resolve().parent / "query_results.txt"))
 
+# Headings excluded from results. Keep the blocklist a frozenset so any Python-side
+# filtering is an O(1) membership check; the filter validator requires a list on the
+# wire, so send a sorted list built once from the set.
+_HEADING_BLOCKLIST = frozenset({
+    "Tags list, block",
+    "Tags list, item",
+    "Tags List - Forge Documentation",
+})
+_HEADING_BLOCKLIST_WIRE = sorted(_HEADING_BLOCKLIST)
+
+
+def _dumps(md: dict) -> str:
+    """Pretty-print metadata; uses orjson when installed (same output shape as json.dumps)."""
+    if orjson is not None:
+        return orjson.dumps(md, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(md, ensure_ascii=False, indent=2)
+
+
 # Detect mode (for header only)
 mode = (
     "CHROMA_HTTP_URL" if os.getenv("CHROMA_HTTP_URL")
@@ -24,42 +48,54 @@ mode = (
     else "UNCONFIGURED"
 )
 
-docs = query_vector_store(
-    store=STORE,
-    query=QUERY,
-    top_k=TOP_K,
-    expand_pages_from_top_k=True,
-    filters={
-        "heading_path": {
-            "$nin": [
-                "Tags list, block",
-                "Tags list, item",
-                "Tags List - Forge Documentation"
-            ]
-        }
-    }
-)
 
-OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-with OUT_PATH.open("w", encoding="utf-8") as f:
-    f.write(f"# STORE={STORE}\n# MODE={mode}\n# QUERY={QUERY}\n# TOP_K={TOP_K}\n\n")
-    if not docs:
-        f.write("No results.\n")
-    else:
-        for i, d in enumerate(docs, 1):
-            md = dict(d.metadata or {})
-            distance = md.pop("_similarity", None)  # attached by the pipeline when available
-            f.write(f"{i}. similarity={distance}\n")
-
-            # Pretty-print ALL metadata
-            f.write("METADATA:\n")
-            f.write(json.dumps(md, ensure_ascii=False, indent=2))
-            f.write("\n")
-
-            # Full content (no truncation)
-            content = (d.page_content or "")
-            f.write("CONTENT:\n")
-            f.write(content)
-            f.write("\n" + "-" * 80 + "\n")
-
-print(f"✅ Full results written to {OUT_PATH}")
+async def _query(query: str):
+    # query_vector_store is synchronous; run it off the event loop so queries overlap
+    return await asyncio.to_thread(
+        query_vector_store,
+        store=STORE,
+        query=query,
+        top_k=TOP_K,
+        expand_pages_from_top_k=True,
+        filters={"heading_path": {"$nin": _HEADING_BLOCKLIST_WIRE}},
+    )
+
+
+def _write_results(out_path: Path, query: str, docs) -> None:
+    with out_path.open("w", encoding="utf-8") as f:
+        f.write(f"# STORE={STORE}\n# MODE={mode}\n# QUERY={query}\n# TOP_K={TOP_K}\n\n")
+        if not docs:
+            f.write("No results.\n")
+        else:
+            for i, d in enumerate(docs, 1):
+                md = dict(d.metadata or {})
+                distance = md.pop("_similarity", None)  # attached by the pipeline when available
+                f.write(f"{i}. similarity={distance}\n")
+
+                # Pretty-print ALL metadata
+                f.write("METADATA:\n")
+                f.write(_dumps(md))
+                f.write("\n")
+
+                # Full content (no truncation)
+                content = (d.page_content or "")
+                f.write("CONTENT:\n")
+                f.write(content)
+                f.write("\n" + "-" * 80 + "\n")
+
+
+async def main() -> None:
+    # Single query (TEST_QUERY) writes to OUT_PATH; a suite (TEST_QUERIES, "|"-separated)
+    # fans out concurrently and writes one file per query (<stem>_<n><suffix>).
+    queries = QUERIES or [QUERY]
+    *results, _ = await asyncio.gather(
+        *(_query(q) for q in queries),
+        asyncio.to_thread(OUT_PATH.parent.mkdir, parents=True, exist_ok=True),
+    )
+    for n, (query, docs) in enumerate(zip(queries, results), 1):
+        out_path = OUT_PATH if len(queries) == 1 else OUT_PATH.with_name(f"{OUT_PATH.stem}_{n}{OUT_PATH.suffix}")
+        _write_results(out_path, query, docs)
+        print(f"✅ Full results written to {out_path}")
+
+
+asyncio.run(main())
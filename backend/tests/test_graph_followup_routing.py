@@ -15,10 +15,42 @@ def tmp_ws(tmp_path: Path) -> Path:
     return ws
 
 
-def test_graph_routes_directly_to_respond_on_followup(monkeypatch: pytest.MonkeyPatch, tmp_ws: Path):
-    # Stub respond_to_user node to capture followup and avoid hitting LLM/providers
-    captured: Dict[str, Any] = {}
+# Per-test respond_to_user behaviour; the module graph dispatches through this slot.
+_RESPOND_IMPL: Dict[str, Any] = {}
+
+
+@pytest.fixture(scope="module")
+def routing_graph():
+    """
+    Compile the graph once for this module.
+
+    build_graph() binds node functions at compile time, so respond_to_user is
+    patched with a dispatcher that calls whatever the current test installed in
+    _RESPOND_IMPL. The planner is stubbed to avoid requiring user_input.
+    """
+    import backend.agent.graph as graph_mod
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(graph_mod, "respond_to_user", lambda state: _RESPOND_IMPL["fn"](state))
+        mp.setattr(graph_mod, "next_task_planner_node", lambda state: state)
+        yield build_graph(_cache=False)
 
+
+@pytest.fixture()
+def captured() -> Dict[str, Any]:
+    return {}
+
+
+@pytest.fixture()
+def respond_stub(monkeypatch: pytest.MonkeyPatch):
+    """Install a respond_to_user implementation for the current test only."""
+    def _install(fn):
+        monkeypatch.setitem(_RESPOND_IMPL, "fn", fn)
+    return _install
+
+
+def test_graph_routes_directly_to_respond_on_followup(routing_graph, respond_stub, captured: Dict[str, Any], tmp_ws: Path):
+    # Stub respond_to_user node to capture followup and avoid hitting LLM/providers
     def stub_respond_node(state: Dict[str, Any]) -> Dict[str, Any]:
         captured["entered"] = True
         captured["followup"] = (state.get("followup_user_input") or "").strip()
@@ -30,16 +62,7 @@ def test_graph_routes_directly_to_respond_on_followup(monkeypatch: pytest.Monkey
             "followup_user_input": "",
         }
 
-    # Patch the symbol used by build_graph (imported into graph module)
-    import backend.agent.graph as graph_mod
-    monkeypatch.setattr(graph_mod, "respond_to_user", stub_respond_node)
-
-    # Also patch planner to avoid requiring user_input in this routing test
-    def stub_planner(state: Dict[str, Any]) -> Dict[str, Any]:
-        return state
-    monkeypatch.setattr(graph_mod, "next_task_planner_node", stub_planner)
-
-    g = build_graph()
+    respond_stub(stub_respond_node)
 
     state: Dict[str, Any] = {
         # Key for START router to jump straight to respond_to_user
@@ -48,7 +71,7 @@ def test_graph_routes_directly_to_respond_on_followup(monkeypatch: pytest.Monkey
         "workspace_path": str(tmp_ws),
     }
 
-    out = g.invoke(state)
+    out = routing_graph.invoke(state)
 
     assert captured.get("entered") is True, "respond_to_user should be invoked when followup is present at START"
     assert captured.get("followup") == "hello from chat"
@@ -56,17 +79,12 @@ def test_graph_routes_directly_to_respond_on_followup(monkeypatch: pytest.Monkey
     assert out.get("last_user_response", "").startswith("echo: hello from chat")
 
 
-def test_graph_awaits_when_no_followup(monkeypatch: pytest.MonkeyPatch, tmp_ws: Path):
+def test_graph_awaits_when_no_followup(routing_graph, respond_stub, tmp_ws: Path):
     # Ensure our respond_to_user stub is NOT invoked in this case
-    # Patch the symbol used by build_graph
-    import backend.agent.graph as graph_mod
-
     def fail_if_called(state: Dict[str, Any]):
         raise AssertionError("respond_to_user should not be called when there is no followup input")
 
-    monkeypatch.setattr(graph_mod, "respond_to_user", fail_if_called)
-
-    g = build_graph()
+    respond_stub(fail_if_called)
 
     # Start in a state that indicates we are awaiting input but have none
     state: Dict[str, Any] = {
@@ -75,8 +93,7 @@ def test_graph_awaits_when_no_followup(monkeypatch: pytest.MonkeyPatch, tmp_ws:
         "workspace_path": str(tmp_ws),
     }
 
-    out = g.invoke(state)
+    out = routing_graph.invoke(state)
 
     # Graph should go to await_user_input then END without calling respond_to_user
     assert out.get("last_user_response") in (None, ""), "There should be no chat response when there is no followup"
-
@@ -4,41 +4,36 @@ from pathlib import Path
 from typing import Any, Dict
 
 import os
-import shutil
 
 import pytest
 
-from backend.agent.graph import build_graph
-
 
 @pytest.mark.slow
-def test_full_graph_runs_with_only_prompt():
+def test_full_graph_runs_with_only_prompt(compiled_graph, tmp_path: Path):
     """
     Drive the entire agent graph from START to END with only a natural-language prompt.
-    No state priming: framework, mc_version, paths, and everything else must be
-    inferred or defaulted by the graph itself.
+    No state priming beyond a temp runs_root: framework, mc_version, and everything
+    else must be inferred or defaulted by the graph itself.
 
     Run from repo root:
 
-      pytest -s -q backend/tests/test_graph_full_pipeline_e2e.py
+      pytest --run-slow -s -q backend/tests/test_graph_full_pipeline_e2e.py
 
     This test executes the real initialization (downloads/extracts MDK, runs Gradle
     smoke task), real planning via providers, and the item subgraph. It requires
     network access and valid provider credentials (e.g., GOOGLE_API_KEY).
     """
-    # Clean slate: delete and recreate the runs folder for each test execution
-    runs_dir = Path("runs")
-    if runs_dir.exists():
-        shutil.rmtree(runs_dir, ignore_errors=True)
-    runs_dir.mkdir(parents=True, exist_ok=True)
+    # Clean slate without touching the repo-level runs/ folder: tmp_path is fresh per test
+    runs_dir = tmp_path / "runs"
 
     # Enable per-node progress logging (also written to runs/test_logs/full_pipeline_run.log)
     os.environ["MM_PROGRESS_LOG"] = "1"
-    g = build_graph()
+    g = compiled_graph
 
-    # Provide only the user's prompt
+    # Provide only the user's prompt (plus the temp runs_root)
     initial_state: Dict[str, Any] = {
         "user_input": "create a sapphire item",
+        "runs_root": str(runs_dir),
     }
 
     # Single invoke; per-node logging is handled by the graph wrappers via MM_PROGRESS_LOG
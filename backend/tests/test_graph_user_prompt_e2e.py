@@ -6,22 +6,20 @@ from typing import Any, Dict
 
 import pytest
 
-from backend.agent.graph import build_graph
-
 
 def _has_google_key() -> bool:
     return bool(os.getenv("GOOGLE_API_KEY"))
 
 
 @pytest.mark.skipif(not _has_google_key(), reason="GOOGLE_API_KEY not set; this test exercises real LLM providers.")
-def test_graph_user_prompt_end_to_end(tmp_path: Path):
+def test_graph_user_prompt_end_to_end(compiled_graph, tmp_path: Path):
     """
     E2E test that drives the graph with a real user prompt and real providers.
     - Skips MDK init by providing minimal init params and _needs_init=False
     - Expects the graph to complete with summarize_and_finish and not raise.
     - Uses a temporary workspace; item_subgraph writes generated files into it.
     """
-    g = build_graph()
+    g = compiled_graph
 
     workspace = tmp_path / "ws"
     workspace.mkdir(parents=True, exist_ok=True)
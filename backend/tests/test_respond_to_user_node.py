@@ -8,16 +8,27 @@ import pytest
 from backend.agent.nodes.respond_to_user import respond_to_user as respond_node
 
 
+# ModItems.java with the two MM anchors the edit path inserts before
+_ANCHOR_CONTENT = (
+    b"package net.example;\n"
+    b"import java.util.*;\n"
+    b"// ==MM:EXTRA_IMPORTS_END==\n"
+    b"public class ModItems {\n"
+    b"    // ==MM:ITEM_REGISTRATIONS_END==\n"
+    b"}\n"
+)
+
+
 class _StubRU:
     def __init__(self, plan_action: str = "PLAN_NEXT_TASKS", choose_files: list[dict] | None = None,
                  act_payload: Dict[str, Any] | None = None):
         self.plan_action = plan_action
         self.choose_files = choose_files or []
         self.act_payload = act_payload or {}
-        self.calls: list[Dict[str, Any]] = []
+        self.call_count = 0
 
     def invoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        self.calls.append(payload)
+        self.call_count += 1
         stage = (payload.get("stage") or "").lower()
         if stage == "decide":
             return {"action": self.plan_action, "reason": "stub"}
@@ -28,21 +39,27 @@ class _StubRU:
         raise ValueError(f"Unexpected stage: {stage}")
 
 
+@pytest.fixture(scope="session")
+def shared_ws(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("respond_to_user_ws")
+
+
 @pytest.fixture()
-def tmp_ws(tmp_path: Path) -> Path:
-    ws = tmp_path / "ws"
+def tmp_ws(shared_ws: Path, request: pytest.FixtureRequest) -> Path:
+    """Per-test subdirectory of the session workspace."""
+    ws = shared_ws / request.node.name
     ws.mkdir(parents=True, exist_ok=True)
     return ws
 
 
-def test_respond_to_user_errors_on_empty_followup(monkeypatch: pytest.MonkeyPatch, tmp_ws: Path):
+def test_respond_to_user_errors_on_empty_followup(monkeypatch: pytest.MonkeyPatch, shared_ws: Path):
     # Monkeypatch the provider builder to return our stub
     import backend.agent.nodes.respond_to_user as node_mod
     stub = _StubRU()
     monkeypatch.setattr(node_mod, "build_respond_to_user", lambda: stub)
 
     state: Dict[str, Any] = {
-        "workspace_path": str(tmp_ws),
+        "workspace_path": str(shared_ws),  # required, but nothing is written before the empty followup fails
         "followup_user_input": "  ",
         "items": {},
     }
@@ -97,16 +114,7 @@ def test_respond_to_user_edit_files_path(monkeypatch: pytest.MonkeyPatch, tmp_ws
     # Prepare a file with anchors
     f = tmp_ws / "src/main/java/net/example/ModItems.java"
     f.parent.mkdir(parents=True, exist_ok=True)
-    content = "\n".join([
-        "package net.example;",
-        "import java.util.*;",
-        "// ==MM:EXTRA_IMPORTS_END==",
-        "public class ModItems {",
-        "    // ==MM:ITEM_REGISTRATIONS_END==",
-        "}",
-        "",
-    ])
-    f.write_text(content, encoding="utf-8")
+    f.write_bytes(_ANCHOR_CONTENT)
 
     import backend.agent.nodes.respond_to_user as node_mod
     stub = _StubRU(
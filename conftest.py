@@ -0,0 +1,15 @@
+"""
+Repo-root pytest hooks.
+
+Command-line options live here rather than in backend/tests/conftest.py: pytest only
+registers options from conftests it loads before parsing arguments, and the root
+conftest is always one of them (whatever paths are passed, e.g. `pytest --run-slow -n auto`).
+"""
+from __future__ import annotations
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption("--run-slow", action="store_true", default=False,
+                     help="run tests marked slow (network, Gradle, LLM)")